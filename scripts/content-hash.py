@@ -6,6 +6,14 @@ Hashes README, build files, and up to 3 key source files in deterministic
 order, producing a stable fingerprint that changes when project structure
 or content changes.
 
+Hashes are memoized under ~/.cache/flux-drive/content-hash, keyed by the
+path, size, and mtime of every discovered file, so repeat runs on an
+unchanged project skip file I/O. Per-file digests are also cached in
+~/.cache/flux-drive/perfile.db, so after a partial change only the edited
+files are re-read. Use --no-cache to force recomputation.
+Pass --algo blake3 (requires the optional blake3 package) for a faster
+SIMD-parallel digest; its output is prefixed 'blake3:'.
+
 Exit codes:
     0  Hash computed (or --check matched)
     1  No hashable files found (or --check mismatched)
@@ -14,15 +22,30 @@ Exit codes:
 from __future__ import annotations
 
 import argparse
+import functools
 import hashlib
 import json
 import os
+import sqlite3
+import stat
+import struct
 import sys
 import tempfile
-from collections import Counter
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -46,6 +69,12 @@ BUILD_FILES = (
 # Source directories to scan for key source files
 SOURCE_DIRS = ("src", "lib")
 
+# Bulk/generated directories never descended into while scanning SOURCE_DIRS
+PRUNE_DIRS = frozenset({
+    ".git", "node_modules", "target", "dist", "build", "__pycache__",
+    "venv", ".venv", ".tox", "vendor",
+})
+
 # Source extensions eligible for key-file selection
 SOURCE_EXTENSIONS = frozenset({
     ".py", ".go", ".rs", ".ts", ".js", ".jsx", ".tsx",
@@ -62,157 +91,507 @@ MAX_FILE_SIZE = 1_048_576
 # Bytes to sample for binary detection
 BINARY_CHECK_SIZE = 512
 
+# Extensions trusted to be text: only the size limit applies, no null-byte
+# probe ("" covers README and Makefile)
+TEXT_EXTENSIONS = SOURCE_EXTENSIONS | frozenset({
+    "", ".md", ".rst", ".txt", ".toml", ".json", ".mod", ".gradle", ".xml",
+})
+
+# Flags for the raw binary-probe open (O_CLOEXEC where the platform has it)
+_PROBE_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_CLOEXEC", 0)
+
+# Read buffer size when streaming file contents into the hasher (64 KiB)
+HASH_CHUNK_SIZE = 65_536
+
+# Below this many bytes to hash, thread-pool start-up (~0.15 ms) costs more
+# than it saves, so files are hashed serially
+PARALLEL_HASH_MIN_BYTES = 1_048_576
+
+# Supported digest algorithms; the name doubles as the output prefix
+HASH_ALGORITHMS = ("sha256", "blake3")
+
+# Per-file digest cache, stored next to the memo directory
+DIGEST_DB_NAME = "perfile.db"
+
+# Domain-separation tag fed into the outer hash; bump when the layout changes
+HASH_FORMAT_TAG = b"content-hash/v2\x00"
+
 
 # ---------------------------------------------------------------------------
 # File discovery
 # ---------------------------------------------------------------------------
 
-def _is_binary(path: Path) -> bool:
+def _stat_and_classify(path: str) -> tuple[bool, int] | None:
+    """Stat a path once, following symlinks.
+
+    Returns (is_regular_file, size), or None if the path cannot be stat'd.
+    """
+    try:
+        st = os.stat(path, follow_symlinks=True)
+    except OSError:
+        return None
+    return stat.S_ISREG(st.st_mode), st.st_size
+
+
+def _is_binary(path: str, size: int | None = None) -> bool:
     """Check if a file is likely binary.
 
     A file is considered binary if it exceeds MAX_FILE_SIZE or contains
-    null bytes in the first BINARY_CHECK_SIZE bytes.
+    null bytes in the first BINARY_CHECK_SIZE bytes. Pass *size* when the
+    caller already has it to skip a redundant stat.
     """
     try:
-        if path.stat().st_size > MAX_FILE_SIZE:
+        if size is None:
+            size = os.stat(path).st_size
+        if size > MAX_FILE_SIZE:
             return True
-        with open(path, "rb") as f:
-            chunk = f.read(BINARY_CHECK_SIZE)
-        return b"\x00" in chunk
+        fd = os.open(path, _PROBE_OPEN_FLAGS)
+        try:
+            chunk = os.read(fd, BINARY_CHECK_SIZE)
+        finally:
+            os.close(fd)
+        return chunk.find(b"\x00") != -1
     except OSError:
         return True
 
 
-def _find_readme(project: Path) -> Path | None:
+def _is_hashable(path: str, ext: str | None = None) -> bool:
+    """True if *path* is a regular, non-binary file.
+
+    Costs one stat. Files whose extension is in TEXT_EXTENSIONS skip the
+    null-byte probe and are only size- and permission-checked (an access()
+    call, no open), so unreadable files are still rejected here rather than
+    silently dropped at hash time. Anything else gets the probe. Pass *ext*
+    when the caller already split it off.
+    """
+    info = _stat_and_classify(path)
+    if info is None:
+        return False
+    is_regular, size = info
+    if not is_regular:
+        return False
+    if ext is None:
+        ext = os.path.splitext(path)[1]
+    if ext in TEXT_EXTENSIONS:
+        return size <= MAX_FILE_SIZE and os.access(path, os.R_OK)
+    return not _is_binary(path, size)
+
+
+def _project_prefix(project: str | Path) -> str:
+    """Return *project* as a string ending in a separator.
+
+    Relative paths are derived by slicing this prefix off absolute paths,
+    avoiding a Path.relative_to() parts-walk per file.
+    """
+    return os.path.join(str(project), "")
+
+
+def _rel_key(path: str, prefix_len: int) -> str:
+    """Relative path of *path* with '/' separators on every platform.
+
+    Used both as the sort key and as the hashed/reported path, so the same
+    tree hashes identically on Linux and Windows checkouts.
+    """
+    rel = path[prefix_len:]
+    return rel if os.sep == "/" else rel.replace(os.sep, "/")
+
+
+def _find_readme(project: str) -> str | None:
     """Find the first existing README variant."""
     for name in README_NAMES:
-        candidate = project / name
-        if candidate.is_file() and not _is_binary(candidate):
+        candidate = os.path.join(project, name)
+        if _is_hashable(candidate):
             return candidate
     return None
 
 
-def _find_build_files(project: Path) -> list[Path]:
+def _find_build_files(project: str) -> list[str]:
     """Find existing build/config files in the project root."""
-    found: list[Path] = []
+    found: list[str] = []
     for name in BUILD_FILES:
-        candidate = project / name
-        if candidate.is_file() and not _is_binary(candidate):
+        candidate = os.path.join(project, name)
+        if _is_hashable(candidate):
             found.append(candidate)
     return found
 
 
-def _find_key_source_files(project: Path) -> list[Path]:
+def _scan_source_dir(source_dir: str, buckets: dict[str, list[str]]) -> None:
+    """Walk *source_dir* breadth-first, bucketing eligible files by extension.
+
+    Uses os.scandir so directory/file classification comes from the cached
+    d_type, and filters by extension before any stat or binary probe.
+    Symlinked directories and PRUNE_DIRS are not descended into.
+    """
+    pending: deque[str] = deque([source_dir])
+    while pending:
+        current = pending.popleft()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in PRUNE_DIRS:
+                            pending.append(entry.path)
+                        continue
+                    ext = os.path.splitext(entry.name)[1]
+                    if ext in SOURCE_EXTENSIONS and _is_hashable(entry.path, ext):
+                        buckets.setdefault(ext, []).append(entry.path)
+        except OSError:
+            continue
+
+
+def _find_key_source_files(project: str) -> list[str]:
     """Find up to MAX_SOURCE_FILES key source files.
 
     Scans SOURCE_DIRS (and the project root as fallback), picks the most
     common source extension, then returns the first MAX_SOURCE_FILES files
     of that extension sorted by relative path.
     """
-    candidates: list[Path] = []
+    # Candidates bucketed by extension; the largest bucket wins
+    buckets: dict[str, list[str]] = {}
 
     # Collect from source directories first
     for dirname in SOURCE_DIRS:
-        source_dir = project / dirname
-        if source_dir.is_dir():
-            try:
-                for entry in source_dir.rglob("*"):
-                    if (
-                        entry.is_file()
-                        and entry.suffix in SOURCE_EXTENSIONS
-                        and not _is_binary(entry)
-                    ):
-                        candidates.append(entry)
-            except OSError:
-                pass
+        source_dir = os.path.join(project, dirname)
+        if os.path.isdir(source_dir):
+            _scan_source_dir(source_dir, buckets)
 
     # Fallback: scan project root (non-recursively)
-    if not candidates:
+    if not buckets:
         try:
-            for entry in project.iterdir():
-                if (
-                    entry.is_file()
-                    and entry.suffix in SOURCE_EXTENSIONS
-                    and not _is_binary(entry)
-                ):
-                    candidates.append(entry)
+            with os.scandir(project) as it:
+                for entry in it:
+                    ext = os.path.splitext(entry.name)[1]
+                    if ext in SOURCE_EXTENSIONS and _is_hashable(entry.path, ext):
+                        buckets.setdefault(ext, []).append(entry.path)
         except OSError:
             pass
 
-    if not candidates:
+    if not buckets:
         return []
 
-    # Find the most common extension
-    ext_counts: Counter[str] = Counter(c.suffix for c in candidates)
-    dominant_ext = ext_counts.most_common(1)[0][0]
+    # Most common extension; ties go to the lexicographically smallest
+    # extension so the choice never depends on directory listing order
+    dominant = buckets[max(sorted(buckets), key=lambda ext: len(buckets[ext]))]
 
-    # Filter to dominant extension, sort by relative path
-    filtered = sorted(
-        (c for c in candidates if c.suffix == dominant_ext),
-        key=lambda p: str(p.relative_to(project)),
-    )
-    return filtered[:MAX_SOURCE_FILES]
+    # Sort by relative path
+    prefix_len = len(_project_prefix(project))
+    decorated = [(_rel_key(c, prefix_len), c) for c in dominant]
+    decorated.sort()
+    return [c for _, c in decorated[:MAX_SOURCE_FILES]]
 
 
-def discover_files(project: Path) -> list[Path]:
+def discover_files(project: Path) -> list[tuple[str, str]]:
     """Discover all hashable files in deterministic order.
 
-    Returns absolute paths sorted by their relative path from project root.
+    Returns (relative_path, absolute_path) pairs sorted by relative path,
+    so downstream hashing and reporting never re-derive either form.
     """
-    files: list[Path] = []
+    project_str = str(project)
+    files: list[str] = []
 
-    readme = _find_readme(project)
+    readme = _find_readme(project_str)
     if readme is not None:
         files.append(readme)
 
-    files.extend(_find_build_files(project))
-    files.extend(_find_key_source_files(project))
+    files.extend(_find_build_files(project_str))
+    files.extend(_find_key_source_files(project_str))
 
-    # Deduplicate (a root .py file might appear from both build and source)
-    seen: set[Path] = set()
-    unique: list[Path] = []
+    # Deduplicate by relative path (candidates are all built under project,
+    # so no resolve() is needed), then sort by that same key for determinism
+    prefix_len = len(_project_prefix(project_str))
+    by_rel: dict[str, str] = {}
     for f in files:
-        resolved = f.resolve()
-        if resolved not in seen:
-            seen.add(resolved)
-            unique.append(f)
-
-    # Sort by relative path for determinism
-    unique.sort(key=lambda p: str(p.relative_to(project)))
-    return unique
+        by_rel.setdefault(_rel_key(f, prefix_len), f)
+    return [(rel, by_rel[rel]) for rel in sorted(by_rel)]
 
 
 # ---------------------------------------------------------------------------
 # Hashing
 # ---------------------------------------------------------------------------
 
-def compute_hash(project: Path, files: list[Path]) -> str:
-    """Compute SHA-256 hash from file paths and contents.
+def _new_hasher(algo: str = "sha256") -> Any:
+    """Create a hasher for *algo* ("sha256" or "blake3").
+
+    SHA-256 comes from the OpenSSL-backed constructor. The digest is a
+    staleness fingerprint, not a security boundary, so usedforsecurity=False
+    keeps FIPS-mode builds on the fast EVP path (which dispatches to SHA-NI /
+    ARMv8 SHA2 when the CPU has them). BLAKE3 uses the optional ``blake3``
+    package, whose core picks AVX-512/AVX2/SSE4.1/NEON at runtime.
+    """
+    if algo == "blake3":
+        return blake3.blake3(max_threads=blake3.blake3.AUTO)
+    return hashlib.new("sha256", usedforsecurity=False)
+
+
+def _hash_file(rel_path: str, filepath: str, algo: str = "sha256") -> bytes | None:
+    """Hash one file as H(<relative_path>\\0<content>).
+
+    Returns the raw 32-byte digest, or None if the file cannot be opened.
+    """
+    try:
+        f = open(filepath, "rb", buffering=0)
+    except OSError:
+        return None
+    h = _new_hasher(algo)
+    buf = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buf)
+    with f:
+        h.update(f"{rel_path}\x00".encode("utf-8"))
+        while n := f.readinto(buf):
+            h.update(view[:n])
+    return h.digest()
+
+
+def _hash_files(
+    files: list[tuple[str, str]],
+    algo: str = "sha256",
+    db: sqlite3.Connection | None = None,
+    stats: list[os.stat_result] | None = None,
+) -> list[tuple[str, bytes]]:
+    """Return (relative_path, digest) for each readable file, in input order.
+
+    With *db*, digests are first looked up by stat identity (see
+    _digest_ident) and only misses are read and hashed; new digests are
+    written back in one transaction. Pass *stats* (from _stat_files) to
+    reuse stat results the caller already has.
+
+    Misses are hashed on a thread pool (hashlib releases the GIL) only on
+    multi-core machines with at least PARALLEL_HASH_MIN_BYTES to hash;
+    otherwise serially. Unreadable files are skipped.
+    """
+    rel_paths = [rel for rel, _ in files]
+    abs_paths = [abs_path for _, abs_path in files]
+
+    idents: list[bytes | None] = [None] * len(files)
+    digests: list[bytes | None] = [None] * len(files)
+    if db is not None:
+        if stats is None:
+            stats = _stat_files(files)
+        if stats is not None:
+            idents = [_digest_ident(st) for st in stats]
+            digests = [
+                _lookup_digest(db, a, r, algo, ident)
+                for (r, a), ident in zip(files, idents)
+            ]
+
+    misses = [i for i, d in enumerate(digests) if d is None]
+    miss_rels = [rel_paths[i] for i in misses]
+    miss_abs = [abs_paths[i] for i in misses]
+    miss_bytes = sum(stats[i].st_size for i in misses) if stats is not None else 0
+    workers = min(len(misses), os.cpu_count() or 1)
+    hash_file = functools.partial(_hash_file, algo=algo)
+    if workers > 1 and miss_bytes >= PARALLEL_HASH_MIN_BYTES:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            fresh = list(executor.map(hash_file, miss_rels, miss_abs))
+    else:
+        fresh = list(map(hash_file, miss_rels, miss_abs))
+    for i, digest in zip(misses, fresh):
+        digests[i] = digest
+
+    if db is not None:
+        _store_digests(db, [
+            (abs_paths[i], rel_paths[i], algo, idents[i], digest)
+            for i, digest in zip(misses, fresh)
+            if idents[i] is not None and digest is not None
+        ])
+
+    return [(rel, digest) for rel, digest in zip(rel_paths, digests) if digest is not None]
+
+
+def compute_hash(
+    files: list[tuple[str, str]],
+    algo: str = "sha256",
+    db: sqlite3.Connection | None = None,
+    stats: list[os.stat_result] | None = None,
+) -> str:
+    """Compute a content hash from file paths and contents.
+
+    Each file is hashed independently (see _hash_file), then the per-file
+    digests are fed in order into an outer hash:
+        H(HASH_FORMAT_TAG + digest_1 + digest_2 + ...)
+
+    Pass *db* (from _open_digest_db) to reuse per-file digests across runs,
+    and *stats* (from _stat_files) to avoid re-stat'ing the files.
+
+    Returns '<algo>:<hex>' string, e.g. 'sha256:<hex>'.
+    """
+    h = _new_hasher(algo)
+    h.update(HASH_FORMAT_TAG)
+    for _, digest in _hash_files(files, algo, db, stats):
+        h.update(digest)
+    return f"{algo}:{h.hexdigest()}"
+
+
+# ---------------------------------------------------------------------------
+# Memo cache
+# ---------------------------------------------------------------------------
+
+def _memo_dir() -> Path:
+    """Directory holding memoized hashes (honours XDG_CACHE_HOME)."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "flux-drive" / "content-hash"
+
+
+def _stat_files(files: list[tuple[str, str]]) -> list[os.stat_result] | None:
+    """Stat each discovered file once. Returns None if any stat fails."""
+    try:
+        return [os.stat(abs_path) for _, abs_path in files]
+    except OSError:
+        return None
+
 
-    File contents are concatenated with null-byte separators:
-        <relative_path>\\0<content>\\0<relative_path>\\0<content>...
+def _stat_fingerprint(
+    project: Path,
+    files: list[tuple[str, str]],
+    stats: list[os.stat_result],
+    algo: str = "sha256",
+) -> str:
+    """Fingerprint the discovered files by (relative path, size, mtime_ns).
 
-    Returns 'sha256:<hex>' string.
+    Any edit, checkout, or added/removed file changes the fingerprint.
+    *stats* are the matching results from _stat_files.
     """
-    h = hashlib.sha256()
-    for i, filepath in enumerate(files):
-        rel_path = str(filepath.relative_to(project))
+    h = hashlib.blake2b(digest_size=32)
+    h.update(HASH_FORMAT_TAG)
+    h.update(algo.encode("ascii") + b"\x00")
+    h.update(str(project).encode("utf-8") + b"\x00")
+    for (rel, _), st in zip(files, stats):
+        h.update(f"{rel}:{st.st_size}:{st.st_mtime_ns}\x00".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _memo_path(project: Path, algo: str = "sha256") -> Path:
+    """Memo file for *project*: one per (project, algo), overwritten in place."""
+    key = hashlib.blake2b(f"{project}\x00{algo}".encode("utf-8"), digest_size=16)
+    return _memo_dir() / key.hexdigest()
+
+
+def _read_memo(project: Path, fingerprint: str, algo: str = "sha256") -> str | None:
+    """Return the memoized hash if it was stored under *fingerprint*, else None."""
+    try:
+        stored_fp, _, value = _memo_path(project, algo).read_text(encoding="utf-8").partition("\n")
+    except OSError:
+        return None
+    value = value.strip()
+    if stored_fp != fingerprint or not value.startswith(f"{algo}:"):
+        return None
+    return value
+
+
+def _write_memo(
+    project: Path, fingerprint: str, content_hash: str, algo: str = "sha256",
+) -> None:
+    """Store *fingerprint* and *content_hash* in the project's memo file.
+
+    Atomic replace, best-effort: the memo is a pure speedup, so write
+    failures are ignored.
+    """
+    memo_dir = _memo_dir()
+    try:
+        memo_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=memo_dir, suffix=".tmp", delete=False,
+        ) as tmp:
+            tmp.write(f"{fingerprint}\n{content_hash}\n")
+    except OSError:
+        return
+    try:
+        os.replace(tmp.name, _memo_path(project, algo))
+    except OSError:
         try:
-            content = filepath.read_bytes()
+            os.unlink(tmp.name)
         except OSError:
-            continue
-        if i > 0:
-            h.update(b"\x00")
-        h.update(rel_path.encode("utf-8"))
-        h.update(b"\x00")
-        h.update(content)
-    return f"sha256:{h.hexdigest()}"
+            pass
+
+
+def _open_digest_db() -> sqlite3.Connection | None:
+    """Open (creating if needed) the per-file digest cache.
+
+    One row per (path, relative path, algo): an edited file replaces its
+    row rather than adding one. Returns None if the cache cannot be opened;
+    hashing then proceeds without it.
+    """
+    path = _memo_dir().parent / DIGEST_DB_NAME
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path, timeout=1.0)
+    except (OSError, sqlite3.Error):
+        return None
+    try:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS file_digests ("
+            "path TEXT NOT NULL, rel TEXT NOT NULL, algo TEXT NOT NULL, "
+            "ident BLOB NOT NULL, digest BLOB NOT NULL, "
+            "PRIMARY KEY (path, rel, algo))"
+        )
+    except sqlite3.Error:
+        conn.close()
+        return None
+    return conn
+
+
+def _digest_ident(st: os.stat_result) -> bytes:
+    """Stat identity a cached digest is valid for: (dev, inode, mtime_ns, size).
+
+    Any real content change moves the mtime (or the inode, for editors that
+    write-and-rename), so a matching identity is safe to reuse.
+    """
+    return struct.pack("=QQqq", st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _lookup_digest(
+    db: sqlite3.Connection, path: str, rel_path: str, algo: str, ident: bytes | None,
+) -> bytes | None:
+    """Return the cached digest if its stat identity matches, else None."""
+    if ident is None:
+        return None
+    try:
+        row = db.execute(
+            "SELECT ident, digest FROM file_digests WHERE path = ? AND rel = ? AND algo = ?",
+            (path, rel_path, algo),
+        ).fetchone()
+    except sqlite3.Error:
+        return None
+    if row is None or row[0] != ident:
+        return None
+    return row[1]
+
+
+def _store_digests(
+    db: sqlite3.Connection, entries: list[tuple[str, str, str, bytes, bytes]],
+) -> None:
+    """Upsert (path, rel, algo, ident, digest) rows in one transaction (best-effort)."""
+    if not entries:
+        return
+    try:
+        with db:
+            db.executemany(
+                "INSERT OR REPLACE INTO file_digests (path, rel, algo, ident, digest) "
+                "VALUES (?, ?, ?, ?, ?)",
+                entries,
+            )
+    except sqlite3.Error:
+        pass
 
 
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
 
+def _print_json(payload: dict[str, Any]) -> None:
+    """Write *payload* as one JSON line to stdout.
+
+    Uses orjson when installed (serializes straight to UTF-8 bytes, no
+    extra encode step), otherwise the stdlib json module.
+    """
+    if orjson is None:
+        print(json.dumps(payload))
+        return
+    sys.stdout.flush()
+    sys.stdout.buffer.write(orjson.dumps(payload) + b"\n")
+    sys.stdout.buffer.flush()
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Compute deterministic SHA-256 content hash from project key files.",
@@ -231,8 +610,23 @@ def main() -> int:
         metavar="HASH",
         help="Compare computed hash against provided hash",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Recompute the hash, ignoring memoized results and cached per-file digests",
+    )
+    parser.add_argument(
+        "--algo",
+        choices=HASH_ALGORITHMS,
+        default="sha256",
+        help="Digest algorithm (default: sha256; blake3 requires the blake3 package)",
+    )
     args = parser.parse_args()
 
+    if args.algo == "blake3" and blake3 is None:
+        print("Error: blake3 is required for --algo blake3 – install with: pip install blake3", file=sys.stderr)
+        return 2
+
     project = args.project_root.resolve()
     if not project.is_dir():
         print(f"Error: {project} is not a directory", file=sys.stderr)
@@ -246,14 +640,29 @@ def main() -> int:
 
     if not files:
         if args.json_output:
-            print(json.dumps({"error": "no hashable files found", "files": []}))
+            _print_json({"error": "no hashable files found", "files": []})
         else:
             print("Error: no hashable files found", file=sys.stderr)
         return 1
 
     try:
-        rel_paths = [str(f.relative_to(project)) for f in files]
-        content_hash = compute_hash(project, files)
+        rel_paths = [rel for rel, _ in files]
+        stats = _stat_files(files)
+        fingerprint = None
+        if stats is not None:
+            fingerprint = _stat_fingerprint(project, files, stats, args.algo)
+        content_hash = None
+        if fingerprint is not None and not args.no_cache:
+            content_hash = _read_memo(project, fingerprint, args.algo)
+        if content_hash is None:
+            db = None if args.no_cache else _open_digest_db()
+            try:
+                content_hash = compute_hash(files, args.algo, db, stats)
+            finally:
+                if db is not None:
+                    db.close()
+            if fingerprint is not None:
+                _write_memo(project, fingerprint, content_hash, args.algo)
     except Exception as exc:
         print(f"Error computing hash: {exc}", file=sys.stderr)
         return 2
@@ -262,18 +671,18 @@ def main() -> int:
     if args.check is not None:
         if content_hash == args.check:
             if args.json_output:
-                print(json.dumps({"match": True, "hash": content_hash, "files": rel_paths}))
+                _print_json({"match": True, "hash": content_hash, "files": rel_paths})
             return 0
         else:
             if args.json_output:
-                print(json.dumps({"match": False, "expected": args.check, "actual": content_hash, "files": rel_paths}))
+                _print_json({"match": False, "expected": args.check, "actual": content_hash, "files": rel_paths})
             else:
                 print(f"Mismatch: expected {args.check}, got {content_hash}", file=sys.stderr)
             return 1
 
     # Normal output
     if args.json_output:
-        print(json.dumps({"hash": content_hash, "files": rel_paths}))
+        _print_json({"hash": content_hash, "files": rel_paths})
     else:
         print(content_hash)
 
@@ -3,7 +3,8 @@
 
 Scans directories, files, build-system dependencies, and source keywords
 to classify a project into one or more domains (e.g. game-simulation,
-web-api, ml-pipeline).  Results are cached at {PROJECT}/.claude/intersense.yaml.
+web-api, ml-pipeline).  Results are cached at {PROJECT}/.claude/intersense.yaml
+(written as JSON, which any YAML parser also reads).
 
 Exit codes:
     0  Domains detected (or cache is fresh when --check-stale)
@@ -17,6 +18,7 @@ from __future__ import annotations
 import argparse
 import datetime as dt
 import fnmatch
+import functools
 import hashlib
 import json
 import os
@@ -34,6 +36,27 @@ except ImportError:
     print("Error: pyyaml is required – install with: pip install pyyaml", file=sys.stderr)
     raise SystemExit(2)
 
+# xxHash3 is optional: structural hashing is for cache invalidation only,
+# so a fast non-cryptographic hash suffices; fall back to SHA-256
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# pyahocorasick is optional: one automaton pass finds every domain's keywords
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Prefer the LibYAML C loader/dumper (~10x faster); fall back to pure Python
+try:
+    from yaml import CSafeDumper as _YamlDumper
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
+    from yaml import SafeLoader as _YamlLoader
+
 PLUGIN_ROOT = Path(__file__).resolve().parent.parent
 DEFAULT_INDEX = PLUGIN_ROOT / "config" / "domains" / "index.yaml"
 
@@ -43,23 +66,40 @@ W_FILE = 0.2
 W_FRAMEWORK = 0.3
 W_KEYWORD = 0.2
 
+# Max source files read for keyword signals
+KEYWORD_FILE_LIMIT = 5
+
+# Per-file and total byte caps for the keyword blob (imports and class
+# definitions live near the top; generated bundles are mostly noise)
+KEYWORD_FILE_BYTES = 65_536
+KEYWORD_BLOB_BUDGET = 256_000
+
 # Source extensions to scan for keyword signals
-SOURCE_EXTENSIONS = {".py", ".go", ".rs", ".ts", ".js", ".java", ".kt", ".swift", ".c", ".cpp", ".h", ".gd", ".dart"}
+SOURCE_EXTENSIONS = frozenset({".py", ".go", ".rs", ".ts", ".js", ".java", ".kt", ".swift", ".c", ".cpp", ".h", ".gd", ".dart"})
 
 # Current cache format version — bump when schema changes
-CACHE_VERSION = 1
+# (v2: cache is written as JSON instead of YAML)
+CACHE_VERSION = 2
+
+# Structural hash algorithm: (output prefix, digest constructor). Depends on
+# the environment, so it is recorded in the hash prefix rather than in
+# CACHE_VERSION; tier 1 skips hashes written with a different algorithm.
+if xxhash is not None:
+    STRUCTURAL_HASH_ALGO, _structural_digest = "xxh3-128", xxhash.xxh3_128
+else:
+    STRUCTURAL_HASH_ALGO, _structural_digest = "sha256", hashlib.sha256
 
 # Files whose presence/absence/content indicates structural project changes
-STRUCTURAL_FILES = {
+STRUCTURAL_FILES = frozenset({
     "package.json", "Cargo.toml", "go.mod", "pyproject.toml",
     "requirements.txt", "Gemfile", "build.gradle", "build.gradle.kts",
     "project.godot", "pom.xml", "CMakeLists.txt", "Makefile",
-}
+})
 
 # File extensions indicating structural project type changes (new tech stack)
-STRUCTURAL_EXTENSIONS = {
+STRUCTURAL_EXTENSIONS = frozenset({
     ".gd", ".tscn", ".unity", ".uproject",
-}
+})
 
 
 # ---------------------------------------------------------------------------
@@ -76,12 +116,16 @@ class DomainSpec:
         self.directories: list[str] = signals.get("directories", [])
         self.files: list[str] = signals.get("files", [])
         self.frameworks: list[str] = signals.get("frameworks", [])
+        # Normalised once here for set lookups against _collect_all_deps
+        self.frameworks_norm: list[str] = [_normalise_dep(fw) for fw in self.frameworks]
         self.keywords: list[str] = signals.get("keywords", [])
+        # Lowercased once here; the keyword scan matches against lowercased text
+        self.keywords_lower: list[str] = [kw.lower() for kw in self.keywords]
 
 
 def load_index(path: Path) -> list[DomainSpec]:
     """Load domain definitions from index.yaml."""
-    data = yaml.safe_load(path.read_text(encoding="utf-8"))
+    data = yaml.load(path.read_text(encoding="utf-8"), Loader=_YamlLoader)
     return [DomainSpec(d) for d in data["domains"]]
 
 
@@ -89,30 +133,52 @@ def load_index(path: Path) -> list[DomainSpec]:
 # Structural hash
 # ---------------------------------------------------------------------------
 
+def _hash_structural_file(project: Path, name: str) -> str:
+    """Return the hex digest of one structural file, or the absent sentinel."""
+    fpath = project / name
+    if fpath.is_file():
+        try:
+            with open(fpath, "rb") as fp:
+                return hashlib.file_digest(fp, _structural_digest).hexdigest()
+        except OSError:
+            pass
+    return "__absent__"
+
+
 def compute_structural_hash(project: Path) -> str:
     """Compute deterministic hash of structural files.
 
     For each file in sorted(STRUCTURAL_FILES):
-      - If file exists: sha256(file_contents)
+      - If file exists: H(file_contents)
       - If file missing: sentinel "__absent__"
     Concatenate "filename:hash\\n" pairs, hash the result.
-    Returns "sha256:{hex}" prefixed string.
+
+    H is xxh3-128 when the xxhash package is installed, else SHA-256.
+    Returns "{algo}:{hex}" prefixed string, e.g. "xxh3-128:{hex}".
     """
-    parts: list[str] = []
-    for name in sorted(STRUCTURAL_FILES):
-        fpath = project / name
-        if fpath.is_file():
-            try:
-                content = fpath.read_bytes()
-                file_hash = hashlib.sha256(content).hexdigest()
-            except OSError:
-                file_hash = "__absent__"
-        else:
-            file_hash = "__absent__"
-        parts.append(f"{name}:{file_hash}")
+    parts = [
+        f"{name}:{_hash_structural_file(project, name)}"
+        for name in sorted(STRUCTURAL_FILES)
+    ]
     combined = "\n".join(parts) + "\n"
-    overall = hashlib.sha256(combined.encode("utf-8")).hexdigest()
-    return f"sha256:{overall}"
+    overall = _structural_digest(combined.encode("utf-8")).hexdigest()
+    return f"{STRUCTURAL_HASH_ALGO}:{overall}"
+
+
+def compute_structural_stat(project: Path) -> dict[str, list[int]]:
+    """Snapshot [mtime_ns, size] for each structural file that exists.
+
+    Stored alongside structural_hash so an unchanged tree can be confirmed
+    fresh from stat alone (see _check_stale_tier0).
+    """
+    snapshot: dict[str, list[int]] = {}
+    for name in sorted(STRUCTURAL_FILES):
+        try:
+            st = os.stat(project / name)
+        except OSError:
+            continue
+        snapshot[name] = [st.st_mtime_ns, st.st_size]
+    return snapshot
 
 
 # ---------------------------------------------------------------------------
@@ -120,11 +186,23 @@ def compute_structural_hash(project: Path) -> str:
 # ---------------------------------------------------------------------------
 
 def read_cache(path: Path) -> dict[str, Any] | None:
-    """Read existing cache file. Returns None if absent or unparseable."""
+    """Read existing cache file. Returns None if absent or unparseable.
+
+    Current caches are JSON; legacy or hand-edited YAML caches are still
+    accepted via the YAML loader.
+    """
     if not path.exists():
         return None
     try:
-        data = yaml.safe_load(path.read_text(encoding="utf-8"))
+        text = path.read_text(encoding="utf-8")
+        data = None
+        if text.lstrip().startswith("{"):
+            try:
+                data = json.loads(text)
+            except ValueError:
+                pass
+        if data is None:
+            data = yaml.load(text, Loader=_YamlLoader)
         if isinstance(data, dict) and data.get("domains"):
             return data
     except Exception:
@@ -132,29 +210,47 @@ def read_cache(path: Path) -> dict[str, Any] | None:
     return None
 
 
-def write_cache(path: Path, results: list[dict[str, Any]], structural_hash: str | None = None) -> None:
-    """Write detection results as YAML cache with atomic rename.
+def write_cache(
+    path: Path,
+    results: list[dict[str, Any]],
+    structural_hash: str | None = None,
+    structural_stat: dict[str, list[int]] | None = None,
+) -> None:
+    """Write detection results as JSON cache with atomic rename.
 
-    Uses temp-file-and-rename pattern to prevent corruption from
-    interrupted writes.
+    JSON is a subset of YAML, so consumers that parse the cache as YAML
+    keep working. Uses temp-file-and-rename pattern to prevent corruption
+    from interrupted writes.
     """
     path.parent.mkdir(parents=True, exist_ok=True)
     payload: dict[str, Any] = {
+        "comment": "Auto-detected by flux-drive. Edit to override.",
         "cache_version": CACHE_VERSION,
         "domains": results,
         "detected_at": dt.datetime.now(dt.timezone.utc).isoformat(),
     }
     if structural_hash is not None:
         payload["structural_hash"] = structural_hash
-    header = "# Auto-detected by flux-drive. Edit to override.\n"
-    content = (header + yaml.dump(payload, default_flow_style=False, sort_keys=False)).encode("utf-8")
+    if structural_stat is not None:
+        payload["structural_stat"] = structural_stat
+    _write_cache_payload(path, payload)
+
+
+def _write_cache_payload(path: Path, payload: dict[str, Any]) -> None:
+    """Serialize *payload* as JSON and write it to *path* atomically.
+
+    The cache is a derived artifact, so fsync is skipped unless
+    INTERSENSE_FSYNC=1 — a crash at worst loses a rebuildable file.
+    """
+    content = (json.dumps(payload, indent=2, sort_keys=False) + "\n").encode("utf-8")
 
     fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
     try:
         os.write(fd, content)
-        os.fsync(fd)
+        if os.environ.get("INTERSENSE_FSYNC") == "1":
+            os.fsync(fd)
         os.close(fd)
-        os.rename(tmp_path, str(path))  # atomic on POSIX
+        os.replace(tmp_path, path)  # atomic on POSIX and Windows
     except Exception:
         try:
             os.close(fd)
@@ -171,8 +267,12 @@ def write_cache(path: Path, results: list[dict[str, Any]], structural_hash: str
 # Staleness detection
 # ---------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=16)
 def _parse_iso_datetime(s: str) -> dt.datetime | None:
-    """Parse an ISO 8601 datetime string, returning None on failure."""
+    """Parse an ISO 8601 datetime string, returning None on failure.
+
+    Memoized: every staleness tier parses the same detected_at value.
+    """
     if not s:
         return None
     try:
@@ -189,23 +289,71 @@ def _parse_iso_datetime(s: str) -> dt.datetime | None:
             return None
 
 
+def _check_stale_tier0(project: Path, cache: dict[str, Any]) -> int | None:
+    """Tier 0: Stat comparison (no file reads).
+
+    Returns:
+        0 if every structural file has the cached (mtime_ns, size) and no
+          structural file appeared or disappeared (fresh)
+        None if anything differs or the snapshot is missing (try next tier)
+    """
+    cached_stat = cache.get("structural_stat")
+    if not isinstance(cached_stat, dict):
+        return None
+    current_stat = compute_structural_stat(project)
+    if current_stat.keys() != cached_stat.keys():
+        return None
+    for name, current in current_stat.items():
+        cached = cached_stat[name]
+        if not isinstance(cached, list) or cached != current:
+            return None  # changed, or a hand-edited value we can't compare
+    return 0
+
+
 def _check_stale_tier1(project: Path, cache: dict[str, Any]) -> int | None:
     """Tier 1: Structural hash comparison (<100ms).
 
     Returns:
         0 if hash matches (fresh)
         3 if hash differs (stale)
-        None if hash missing from cache (try next tier)
+        None if hash missing from cache or written with another algorithm
+          (try next tier)
     """
     cached_hash = cache.get("structural_hash")
     if not cached_hash or not isinstance(cached_hash, str):
         return None
+    if not cached_hash.startswith(f"{STRUCTURAL_HASH_ALGO}:"):
+        return None  # written with another algorithm (xxhash present/absent)
     current_hash = compute_structural_hash(project)
     if current_hash == cached_hash:
         return 0
     return 3
 
 
+def _is_shallow_repo(project: Path, git_dir: Path) -> bool:
+    """True if the repository is a shallow clone.
+
+    Looks for the ``shallow`` marker in the git directory, following a
+    ``gitdir:`` pointer when .git is a file (worktrees, submodules).
+    """
+    if git_dir.is_file():
+        try:
+            pointer = git_dir.read_text(encoding="utf-8").strip()
+        except OSError:
+            return False
+        if not pointer.startswith("gitdir:"):
+            return False
+        git_dir = project / pointer[len("gitdir:"):].strip()
+        # Worktrees keep the shallow marker in the common git dir
+        commondir = git_dir / "commondir"
+        if commondir.is_file():
+            try:
+                git_dir = git_dir / commondir.read_text(encoding="utf-8").strip()
+            except OSError:
+                pass
+    return (git_dir / "shallow").exists()
+
+
 def _check_stale_tier2(project: Path, cache: dict[str, Any], dry_run: bool = False) -> int | None:
     """Tier 2: Git log check (<500ms).
 
@@ -218,16 +366,10 @@ def _check_stale_tier2(project: Path, cache: dict[str, Any], dry_run: bool = Fal
     if not git_dir.exists():
         return None
 
-    # Detect shallow clone — git log --since is unreliable without full history
-    try:
-        shallow_check = subprocess.run(
-            ["git", "rev-parse", "--is-shallow-repository"],
-            capture_output=True, text=True, timeout=5, cwd=str(project),
-        )
-        if shallow_check.returncode == 0 and shallow_check.stdout.strip() == "true":
-            return None  # fall to tier 3
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
+    # Detect shallow clone — git log --since is unreliable without full history.
+    # Checked via the marker file directly to avoid a git subprocess.
+    if _is_shallow_repo(project, git_dir):
+        return None  # fall to tier 3
 
     detected_at = cache.get("detected_at", "")
     parsed = _parse_iso_datetime(str(detected_at))
@@ -236,11 +378,11 @@ def _check_stale_tier2(project: Path, cache: dict[str, Any], dry_run: bool = Fal
 
     since_str = parsed.isoformat()
 
-    # Check additions, modifications, copies, deletions (not renames — handled separately)
+    # One git log covers additions, modifications, copies, deletions and renames
     try:
         result = subprocess.run(
-            ["git", "log", f"--since={since_str}", "--diff-filter=ACDM",
-             "--name-only", "--format=", "HEAD"],
+            ["git", "log", f"--since={since_str}", "--diff-filter=ACDMR",
+             "--name-status", "--format=", "HEAD"],
             capture_output=True, text=True, timeout=5, cwd=str(project),
         )
         if result.returncode != 0:
@@ -250,7 +392,19 @@ def _check_stale_tier2(project: Path, cache: dict[str, Any], dry_run: bool = Fal
     except (subprocess.TimeoutExpired, FileNotFoundError):
         return None
 
-    changed_files = {line.strip() for line in result.stdout.splitlines() if line.strip()}
+    changed_files: set[str] = set()
+    renames: set[tuple[str, str]] = set()
+    for line in result.stdout.splitlines():
+        parts = line.strip().split("\t")
+        if len(parts) < 2:
+            continue
+        status = parts[0]
+        if status.startswith("R") and len(parts) >= 3:
+            renames.add((parts[1], parts[2]))
+        elif status.startswith("C") and len(parts) >= 3:
+            changed_files.add(parts[2])  # copy: the new path is the change
+        else:
+            changed_files.add(parts[1])
 
     triggers: list[str] = []
     for f in changed_files:
@@ -261,25 +415,11 @@ def _check_stale_tier2(project: Path, cache: dict[str, Any], dry_run: bool = Fal
         if ext in STRUCTURAL_EXTENSIONS:
             triggers.append(f"structural extension: {f}")
 
-    # Check renames separately
-    try:
-        rename_result = subprocess.run(
-            ["git", "log", f"--since={since_str}", "--diff-filter=R",
-             "--name-status", "--format=", "HEAD"],
-            capture_output=True, text=True, timeout=5, cwd=str(project),
-        )
-        if rename_result.returncode == 0:
-            for line in rename_result.stdout.splitlines():
-                parts = line.strip().split("\t")
-                if len(parts) >= 3:
-                    old_name = os.path.basename(parts[1])
-                    new_name = os.path.basename(parts[2])
-                    old_structural = old_name in STRUCTURAL_FILES
-                    new_structural = new_name in STRUCTURAL_FILES
-                    if old_structural != new_structural:
-                        triggers.append(f"structural rename: {parts[1]} -> {parts[2]}")
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass  # rename check is best-effort
+    for old_path, new_path in renames:
+        old_structural = os.path.basename(old_path) in STRUCTURAL_FILES
+        new_structural = os.path.basename(new_path) in STRUCTURAL_FILES
+        if old_structural != new_structural:
+            triggers.append(f"structural rename: {old_path} -> {new_path}")
 
     if dry_run and triggers:
         for t in triggers:
@@ -303,18 +443,50 @@ def _check_stale_tier3(project: Path, cache: dict[str, Any]) -> int:
     # Convert to epoch for mtime comparison
     detected_epoch = parsed.timestamp()
 
-    for name in STRUCTURAL_FILES:
-        fpath = project / name
-        if fpath.is_file():
-            try:
-                if fpath.stat().st_mtime > detected_epoch:
-                    return 3
-            except OSError:
-                pass
+    # One directory listing instead of is_file() + stat() per structural name
+    try:
+        with os.scandir(project) as it:
+            for entry in it:
+                if entry.name not in STRUCTURAL_FILES:
+                    continue
+                try:
+                    if entry.is_file() and entry.stat().st_mtime > detected_epoch:
+                        return 3
+                except OSError:
+                    pass
+    except OSError:
+        pass
 
     return 0
 
 
+def _heal_cache(project: Path, cache_path: Path, dry_run: bool = False) -> None:
+    """Record the current structural hash/stat in a cache that lacks them.
+
+    Only called after a git or mtime tier found the cache fresh. Best-effort:
+    the next run then takes the tier 0/1 fast path instead of spawning git.
+    Only JSON caches written by this script are healed — hand-edited YAML
+    caches are left untouched. Failures leave the cache as it was.
+    """
+    if dry_run:
+        print("Self-heal: structural hash would be recorded for the tier 0/1 fast path")
+        return
+    try:
+        text = cache_path.read_text(encoding="utf-8")
+        if not text.lstrip().startswith("{"):
+            return
+        cache = json.loads(text)
+        if not isinstance(cache, dict):
+            return
+        # Stat before hashing: a save in between then leaves a stale stat
+        # (tier 0 misses, tier 1 rehashes) rather than a stale hash
+        cache["structural_stat"] = compute_structural_stat(project)
+        cache["structural_hash"] = compute_structural_hash(project)
+        _write_cache_payload(cache_path, cache)
+    except (OSError, TypeError, ValueError):
+        pass
+
+
 def check_stale(project: Path, cache_path: Path, dry_run: bool = False) -> int:
     """Check if cached domain detection is stale.
 
@@ -343,6 +515,15 @@ def check_stale(project: Path, cache_path: Path, dry_run: bool = False) -> int:
             print(f"Cache version {version} != {CACHE_VERSION} — stale ({direction} format).")
         return 3
 
+    # Tier 0: Stat check — skips hashing when nothing was touched
+    tier0 = _check_stale_tier0(project, cache)
+    if dry_run:
+        print(f"Tier 0 (stat): {'unchanged' if tier0 == 0 else 'changed or no snapshot'}")
+    if tier0 is not None:
+        if dry_run:
+            print("  Verdict: FRESH")
+        return tier0
+
     # Tier 1: Hash check
     if dry_run:
         cached_hash = cache.get("structural_hash", "(none)")
@@ -361,6 +542,10 @@ def check_stale(project: Path, cache_path: Path, dry_run: bool = False) -> int:
     if tier2 is not None:
         if dry_run:
             print(f"  Verdict: {'FRESH' if tier2 == 0 else 'STALE'}")
+        # git only sees commits: an uncommitted edit to a root manifest would
+        # be baked into the healed hash, so also require tier 3 to agree
+        if tier2 == 0 and _check_stale_tier3(project, cache) == 0:
+            _heal_cache(project, cache_path, dry_run=dry_run)
         return tier2
 
     # Tier 3: Mtime fallback
@@ -369,6 +554,10 @@ def check_stale(project: Path, cache_path: Path, dry_run: bool = False) -> int:
     tier3 = _check_stale_tier3(project, cache)
     if dry_run:
         print(f"  Verdict: {'FRESH' if tier3 == 0 else 'STALE'}")
+    # Only trust the mtime verdict for healing when git was never an option;
+    # a shallow clone or git error may hide nested structural changes
+    if tier3 == 0 and not (project / ".git").exists():
+        _heal_cache(project, cache_path, dry_run=dry_run)
     return tier3
 
 
@@ -376,46 +565,110 @@ def check_stale(project: Path, cache_path: Path, dry_run: bool = False) -> int:
 # Signal gatherers
 # ---------------------------------------------------------------------------
 
-def gather_directories(project: Path, signals: list[str]) -> float:
-    """Fraction of directory signals that exist under project root."""
-    if not signals:
-        return 0.0
+class ProjectScan:
+    """One-level listing of a project, gathered once and shared by all domains."""
+
+    def __init__(self, project: Path) -> None:
+        self.project = project
+        # Directory names at the project root (including hidden ones)
+        self.dir_names: set[str] = set()
+        # "parent/child" directory pairs one level below the root
+        self.nested_dirs: set[str] = set()
+        # File names in the root and in non-hidden immediate subdirectories
+        self.filenames: set[str] = set()
+        # First KEYWORD_FILE_LIMIT source files, in sorted breadth-first order
+        self.source_files: list[str] = []
+
+
+def _scan_project(project: Path) -> ProjectScan:
+    """Walk the project root and its immediate subdirectories once.
+
+    Uses os.scandir so file/directory checks come from the d_type cached by
+    readdir rather than a stat per entry.
+    """
+    scan = ProjectScan(project)
     try:
-        existing = {e.name for e in project.iterdir() if e.is_dir()}
+        with os.scandir(project) as it:
+            entries = sorted(it, key=lambda e: e.name)
     except OSError:
+        return scan
+    for entry in entries:
+        if entry.is_file():
+            scan.filenames.add(entry.name)
+            if (
+                os.path.splitext(entry.name)[1] in SOURCE_EXTENSIONS
+                and len(scan.source_files) < KEYWORD_FILE_LIMIT
+            ):
+                scan.source_files.append(entry.path)
+        elif entry.is_dir():
+            scan.dir_names.add(entry.name)
+            hidden = entry.name[0] == "."
+            try:
+                with os.scandir(entry.path) as it:
+                    children = sorted(it, key=lambda e: e.name)
+            except OSError:
+                continue
+            for child in children:
+                if child.is_dir():
+                    scan.nested_dirs.add(f"{entry.name}/{child.name}")
+                elif not hidden and child.is_file():
+                    scan.filenames.add(child.name)
+                    if (
+                        os.path.splitext(child.name)[1] in SOURCE_EXTENSIONS
+                        and len(scan.source_files) < KEYWORD_FILE_LIMIT
+                    ):
+                        scan.source_files.append(child.path)
+    return scan
+
+
+def _read_keyword_blob(source_files: list[str]) -> str:
+    """Concatenate and lowercase the keyword-scan source files."""
+    parts: list[str] = []
+    total = 0
+    for sf in source_files:
+        try:
+            with open(sf, "rb") as f:
+                data = f.read(KEYWORD_FILE_BYTES)
+        except OSError:
+            continue
+        text = data.decode("utf-8", errors="ignore") + "\n"
+        parts.append(text)
+        total += len(text)
+        if total >= KEYWORD_BLOB_BUDGET:
+            break
+    return "".join(parts).lower()
+
+
+def gather_directories(scan: ProjectScan, signals: list[str]) -> float:
+    """Fraction of directory signals that exist under project root."""
+    if not signals:
         return 0.0
     # Signals can be nested like "ai/behavior" — check with /
     matches = 0
     for sig in signals:
         if "/" in sig:
-            if (project / sig).is_dir():
+            if sig.count("/") == 1:
+                if sig in scan.nested_dirs:
+                    matches += 1
+            elif (scan.project / sig).is_dir():
                 matches += 1
-        elif sig in existing:
+        elif sig in scan.dir_names:
             matches += 1
     return matches / len(signals)
 
 
-def gather_files(project: Path, signals: list[str]) -> float:
+@functools.lru_cache(maxsize=None)
+def _compile_glob(pattern: str) -> Any:
+    """Compile a file-signal glob once into a regex match function."""
+    return re.compile(fnmatch.translate(pattern)).match
+
+
+def gather_files(filenames: set[str], signals: list[str]) -> float:
     """Fraction of file-pattern signals matching in project root + 1-level subdirs."""
     if not signals:
         return 0.0
-    # Collect filenames from root and immediate subdirectories
-    filenames: set[str] = set()
-    try:
-        for entry in project.iterdir():
-            if entry.is_file():
-                filenames.add(entry.name)
-            elif entry.is_dir() and not entry.name.startswith("."):
-                try:
-                    for child in entry.iterdir():
-                        if child.is_file():
-                            filenames.add(child.name)
-                except OSError:
-                    pass
-    except OSError:
-        return 0.0
-
-    matches = sum(1 for sig in signals if any(fnmatch.fnmatch(f, sig) for f in filenames))
+    patterns = [_compile_glob(sig) for sig in signals]
+    matches = sum(1 for pat in patterns if any(pat(f) for f in filenames))
     return matches / len(signals)
 
 
@@ -461,15 +714,34 @@ def _parse_go_mod_deps(project: Path) -> set[str]:
     try:
         text = gomod.read_text(encoding="utf-8")
         deps: set[str] = set()
-        # Match require ( ... ) blocks
-        for block in re.findall(r"require\s*\((.*?)\)", text, re.DOTALL):
-            for line in block.strip().splitlines():
-                parts = line.strip().split()
-                if parts and not parts[0].startswith("//"):
-                    deps.add(parts[0].split("/")[-1].lower())
-        # Single-line requires: require github.com/foo/bar v1.0
-        for match in re.findall(r"^require\s+(\S+)", text, re.MULTILINE):
-            deps.add(match.split("/")[-1].lower())
+        # Line-oriented state machine: track whether we're inside require ( ... )
+        in_block = False
+
+        def add_entry(entry: str) -> None:
+            tokens = entry.split()
+            if tokens and not tokens[0].startswith("//"):
+                deps.add(tokens[0].split("/")[-1].lower())
+
+        for line in text.splitlines():
+            stripped = line.strip()
+            if in_block:
+                if stripped.startswith(")"):
+                    in_block = False
+                    continue
+                add_entry(stripped)
+            elif stripped.startswith("require"):
+                rest = stripped[len("require"):]
+                if rest.lstrip().startswith("("):
+                    inner = rest.lstrip()[1:]
+                    if ")" in inner:
+                        # Block opened and closed on one line: require ( x v1 )
+                        add_entry(inner.split(")", 1)[0])
+                    else:
+                        add_entry(inner)
+                        in_block = True
+                elif rest[:1].isspace():
+                    # Single-line requires: require github.com/foo/bar v1.0
+                    deps.add(rest.split()[0].split("/")[-1].lower())
         return deps
     except Exception:
         return set()
@@ -515,67 +787,72 @@ def _parse_requirements_txt(project: Path) -> set[str]:
         return set()
 
 
-def gather_frameworks(project: Path, signals: list[str]) -> float:
-    """Fraction of framework signals found in build-system dependency lists."""
-    if not signals:
-        return 0.0
+def _normalise_dep(name: str) -> str:
+    """Normalise a dependency or framework name: lowercase, strip hyphens/underscores."""
+    return name.replace("-", "").replace("_", "").lower()
+
+
+def _collect_all_deps(project: Path) -> frozenset[str]:
+    """Parse every build manifest and return normalised dependency names.
+
+    detect() calls this at most once per run, so all domains share a
+    single parse.
+    """
     all_deps: set[str] = set()
     all_deps.update(_parse_package_json_deps(project))
     all_deps.update(_parse_cargo_toml_deps(project))
     all_deps.update(_parse_go_mod_deps(project))
     all_deps.update(_parse_pyproject_deps(project))
     all_deps.update(_parse_requirements_txt(project))
-    # Normalise for comparison: lowercase, strip hyphens/underscores
-    normalised = {d.replace("-", "").replace("_", "") for d in all_deps}
-    matches = sum(
-        1
-        for sig in signals
-        if sig.replace("-", "").replace("_", "") in normalised
-    )
-    return matches / len(signals)
+    return frozenset(_normalise_dep(d) for d in all_deps)
 
 
-def gather_keywords(project: Path, signals: list[str], limit: int = 5) -> float:
-    """Fraction of keyword signals found in up to *limit* source files."""
-    if not signals:
-        return 0.0
-    # Collect candidate source files (breadth-first, skip hidden dirs)
-    source_files: list[Path] = []
-    try:
-        for entry in sorted(project.iterdir()):
-            if entry.is_file() and entry.suffix in SOURCE_EXTENSIONS:
-                source_files.append(entry)
-            elif entry.is_dir() and not entry.name.startswith("."):
-                try:
-                    for child in sorted(entry.iterdir()):
-                        if child.is_file() and child.suffix in SOURCE_EXTENSIONS:
-                            source_files.append(child)
-                            if len(source_files) >= limit * 3:
-                                break
-                except OSError:
-                    pass
-            if len(source_files) >= limit * 3:
-                break
-    except OSError:
-        return 0.0
+def gather_frameworks(all_deps: frozenset[str], signals_norm: list[str]) -> float:
+    """Fraction of framework signals found in build-system dependency lists.
 
-    source_files = source_files[:limit]
-    if not source_files:
+    *all_deps* comes from _collect_all_deps and *signals_norm* from
+    DomainSpec.frameworks_norm; both are already normalised.
+    """
+    if not signals_norm:
         return 0.0
+    matches = sum(1 for sig in signals_norm if sig in all_deps)
+    return matches / len(signals_norm)
 
-    # Read and search
-    combined = ""
-    for sf in source_files:
-        try:
-            combined += sf.read_text(encoding="utf-8", errors="ignore") + "\n"
-        except OSError:
-            pass
 
-    if not combined:
-        return 0.0
+def _match_keywords(blob: str, domains: list[DomainSpec]) -> set[str] | None:
+    """Find which keywords (across all domains) occur in *blob*.
+
+    Builds a single Aho-Corasick automaton over every domain's lowercased
+    keywords and streams *blob* through it once. Returns None when
+    pyahocorasick is not installed, so callers fall back to per-keyword
+    substring checks.
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for spec in domains:
+        for kw in spec.keywords_lower:
+            if kw:
+                automaton.add_word(kw, kw)
+    if len(automaton) == 0:
+        return set()
+    automaton.make_automaton()
+    return {kw for _, kw in automaton.iter(blob)}
+
 
-    combined_lower = combined.lower()
-    matches = sum(1 for kw in signals if kw.lower() in combined_lower)
+def gather_keywords(blob: str, signals: list[str], found: set[str] | None = None) -> float:
+    """Fraction of keyword signals found in the lowercased source *blob*.
+
+    *signals* must already be lowercased (see DomainSpec.keywords_lower).
+    When *found* (from _match_keywords) is given, it answers membership
+    instead of scanning *blob* once per keyword.
+    """
+    if not signals or not blob:
+        return 0.0
+    if found is not None:
+        matches = sum(1 for kw in signals if kw in found or not kw)
+    else:
+        matches = sum(1 for kw in signals if kw in blob)
     return matches / len(signals)
 
 
@@ -595,11 +872,25 @@ def score_domain(dir_score: float, file_score: float, fw_score: float, kw_score:
 def detect(project: Path, domains: list[DomainSpec], skip_keywords_threshold: bool = True) -> list[dict[str, Any]]:
     """Run detection and return list of detected domain dicts."""
     results: list[dict[str, Any]] = []
+    scan = _scan_project(project)
+    blob: str | None = None  # keyword source text, read on first use
+    found: set[str] | None = None  # keywords present in blob (Aho-Corasick)
+    all_deps: frozenset[str] | None = None  # manifest deps, parsed on first use
 
     for spec in domains:
-        d = gather_directories(project, spec.directories)
-        f = gather_files(project, spec.files)
-        fw = gather_frameworks(project, spec.frameworks)
+        d = gather_directories(scan, spec.directories)
+        f = gather_files(scan.filenames, spec.files)
+        fw = 0.0
+        if spec.frameworks_norm:
+            if all_deps is None:
+                all_deps = _collect_all_deps(project)
+            fw = gather_frameworks(all_deps, spec.frameworks_norm)
+
+        # Performance shortcut: skip domains that cannot reach min_confidence
+        # even with a perfect keyword score
+        upper_bound = score_domain(d, f, fw, 1.0 if spec.keywords else 0.0)
+        if upper_bound < spec.min_confidence:
+            continue
 
         # Performance shortcut: skip keyword scan if already confident
         preliminary = d * W_DIR + f * W_FILE + fw * W_FRAMEWORK
@@ -607,7 +898,10 @@ def detect(project: Path, domains: list[DomainSpec], skip_keywords_threshold: bo
             kw = 0.0
             confidence = preliminary
         else:
-            kw = gather_keywords(project, spec.keywords)
+            if blob is None:
+                blob = _read_keyword_blob(scan.source_files)
+                found = _match_keywords(blob, domains)
+            kw = gather_keywords(blob, spec.keywords_lower, found)
             confidence = score_domain(d, f, fw, kw)
 
         if confidence >= spec.min_confidence:
@@ -670,7 +964,7 @@ def main() -> int:
             if args.json_output:
                 print(json.dumps({"domains": results, "detected_at": cached.get("detected_at", "")}, indent=2))
             else:
-                print(yaml.dump({"domains": results, "detected_at": cached.get("detected_at", "")}, default_flow_style=False, sort_keys=False), end="")
+                print(yaml.dump({"domains": results, "detected_at": cached.get("detected_at", "")}, Dumper=_YamlDumper, default_flow_style=False, sort_keys=False), end="")
             return 0
 
     # Even with --no-cache, respect override: true (user intent, not staleness)
@@ -681,7 +975,7 @@ def main() -> int:
             if args.json_output:
                 print(json.dumps({"domains": results, "detected_at": cached.get("detected_at", "")}, indent=2))
             else:
-                print(yaml.dump({"domains": results, "detected_at": cached.get("detected_at", "")}, default_flow_style=False, sort_keys=False), end="")
+                print(yaml.dump({"domains": results, "detected_at": cached.get("detected_at", "")}, Dumper=_YamlDumper, default_flow_style=False, sort_keys=False), end="")
             return 0
 
     # Run detection
@@ -691,16 +985,17 @@ def main() -> int:
     if not results:
         return 1
 
-    # Compute structural hash for cache
+    # Compute structural stat and hash for cache (stat first, see _heal_cache)
+    structural_stat = compute_structural_stat(project)
     structural_hash = compute_structural_hash(project)
 
     # Write cache and output
-    write_cache(cache_path, results, structural_hash=structural_hash)
+    write_cache(cache_path, results, structural_hash=structural_hash, structural_stat=structural_stat)
     output = {"domains": results, "detected_at": dt.datetime.now(dt.timezone.utc).isoformat()}
     if args.json_output:
         print(json.dumps(output, indent=2))
     else:
-        print(yaml.dump(output, default_flow_style=False, sort_keys=False), end="")
+        print(yaml.dump(output, Dumper=_YamlDumper, default_flow_style=False, sort_keys=False), end="")
     return 0
 
 
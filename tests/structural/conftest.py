@@ -1,5 +1,6 @@
 """Shared fixtures for structural tests."""
 
+import importlib.util
 import json
 from pathlib import Path
 
@@ -37,3 +38,12 @@ def plugin_json(project_root: Path) -> dict:
     """Parsed plugin.json."""
     with open(project_root / ".claude-plugin" / "plugin.json") as f:
         return json.load(f)
+
+
+@pytest.fixture(scope="session")
+def dd(scripts_dir: Path):
+    """scripts/detect-domains.py loaded as a module."""
+    spec = importlib.util.spec_from_file_location("detect_domains", scripts_dir / "detect-domains.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,116 @@
+"""Tests for content-hash.py discovery and its memo / per-file digest caches."""
+
+import importlib.util
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    root = tmp_path / "proj"
+    (root / "src" / "node_modules").mkdir(parents=True)
+    (root / "README.md").write_text("# demo\n")
+    (root / "pyproject.toml").write_text("[project]\nname = 'demo'\n")
+    (root / "src" / "a.py").write_text("A = 1\n")
+    (root / "src" / "b.py").write_text("B = 2\n")
+    (root / "src" / "node_modules" / "aa.py").write_text("vendored = True\n")
+    return root
+
+
+@pytest.fixture
+def run(scripts_dir: Path, tmp_path: Path):
+    """Run content-hash.py with its caches under tmp_path; returns the process."""
+    env = dict(os.environ, XDG_CACHE_HOME=str(tmp_path / "cache"))
+
+    def _run(*args: str, extra_env: dict | None = None) -> subprocess.CompletedProcess:
+        return subprocess.run(
+            [sys.executable, str(scripts_dir / "content-hash.py"), *map(str, args)],
+            env={**env, **(extra_env or {})}, capture_output=True, text=True,
+        )
+    return _run
+
+
+def _memo_files(tmp_path: Path) -> list[Path]:
+    memo_dir = tmp_path / "cache" / "flux-drive" / "content-hash"
+    return sorted(p for p in memo_dir.iterdir() if p.suffix != ".tmp")
+
+
+def _db(tmp_path: Path) -> sqlite3.Connection:
+    return sqlite3.connect(tmp_path / "cache" / "flux-drive" / "perfile.db")
+
+
+def test_discovery_prunes_bulk_dirs(run, project):
+    out = run(project, "--json", "--no-cache")
+    assert out.returncode == 0
+    assert '"src/node_modules/aa.py"' not in out.stdout
+    assert '"src/a.py"' in out.stdout and '"src/b.py"' in out.stdout
+
+
+def test_memo_hit_on_unchanged_tree(run, project, tmp_path):
+    first = run(project).stdout.strip()
+    [memo] = _memo_files(tmp_path)
+    fingerprint = memo.read_text().splitlines()[0]
+    # Plant a marker hash under the current fingerprint: a hit returns it as-is
+    memo.write_text(f"{fingerprint}\nsha256:memo-hit\n")
+    assert run(project).stdout.strip() == "sha256:memo-hit"
+    assert first.startswith("sha256:")
+
+
+def test_memo_invalidated_by_edit(run, project, tmp_path):
+    run(project)
+    [memo] = _memo_files(tmp_path)
+    fingerprint = memo.read_text().splitlines()[0]
+    memo.write_text(f"{fingerprint}\nsha256:memo-hit\n")
+    (project / "src" / "a.py").write_text("A = 10\n")
+
+    fresh = run(project).stdout.strip()
+    assert fresh != "sha256:memo-hit"
+    assert fresh == run(project, "--no-cache").stdout.strip()
+    assert len(_memo_files(tmp_path)) == 1  # overwritten, not accumulated
+
+
+def test_per_file_digests_reused_after_partial_edit(run, project, tmp_path):
+    run(project)
+    with _db(tmp_path) as db:
+        rows = db.execute("SELECT COUNT(*) FROM file_digests").fetchone()[0]
+        # Poison the unchanged README's cached digest: reuse shows up in the result
+        db.execute("UPDATE file_digests SET digest = ? WHERE rel = 'README.md'", (b"\x00" * 32,))
+    for memo in _memo_files(tmp_path):
+        memo.unlink()
+    (project / "src" / "b.py").write_text("B = 20\n")
+
+    reused = run(project).stdout.strip()
+    assert reused != run(project, "--no-cache").stdout.strip()
+    with _db(tmp_path) as db:
+        assert db.execute("SELECT COUNT(*) FROM file_digests").fetchone()[0] == rows
+
+
+def test_no_cache_bypasses_both_caches(run, project, tmp_path):
+    expected = run(project).stdout.strip()
+    [memo] = _memo_files(tmp_path)
+    fingerprint = memo.read_text().splitlines()[0]
+    memo.write_text(f"{fingerprint}\nsha256:memo-hit\n")
+    with _db(tmp_path) as db:
+        db.execute("UPDATE file_digests SET digest = ?", (b"\x00" * 32,))
+    assert run(project, "--no-cache").stdout.strip() == expected
+
+
+@pytest.mark.skipif(importlib.util.find_spec("blake3") is None, reason="blake3 not installed")
+def test_blake3_prefix(run, project):
+    out = run(project, "--algo", "blake3")
+    assert out.returncode == 0
+    assert out.stdout.startswith("blake3:")
+
+
+def test_blake3_missing_is_clean_error(run, project, tmp_path):
+    shim = tmp_path / "shim"
+    shim.mkdir()
+    (shim / "blake3.py").write_text("raise ImportError('blake3 hidden for test')\n")
+    out = run(project, "--algo", "blake3", extra_env={"PYTHONPATH": str(shim)})
+    assert out.returncode == 2
+    assert "blake3 is required" in out.stderr
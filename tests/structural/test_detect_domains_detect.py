@@ -0,0 +1,17 @@
+"""Tests for detect-domains.py signal scoring."""
+
+import json
+
+
+def test_detect_sees_manifest_changes_between_calls(dd, tmp_path):
+    """Dependencies are re-read on every detect() call, not memoized per process."""
+    domains = [dd.DomainSpec({
+        "profile": "web-api",
+        "min_confidence": 0.1,
+        "signals": {"frameworks": ["express"]},
+    })]
+    (tmp_path / "package.json").write_text(json.dumps({"dependencies": {}}))
+    assert dd.detect(tmp_path, domains) == []
+
+    (tmp_path / "package.json").write_text(json.dumps({"dependencies": {"express": "^4"}}))
+    assert [r["name"] for r in dd.detect(tmp_path, domains)] == ["web-api"]
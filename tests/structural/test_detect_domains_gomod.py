@@ -0,0 +1,22 @@
+"""Tests for detect-domains.py go.mod dependency parsing."""
+
+import pytest
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("require github.com/spf13/cobra v1.8.0\n", {"cobra"}),
+    (
+        "require (\n"
+        "\tgithub.com/gin-gonic/gin v1.9.0 // indirect\n"
+        "\t// comment\n"
+        "\tgo.uber.org/Zap v1.0.0\n"
+        ")\n",
+        {"gin", "zap"},
+    ),
+    ("require ( github.com/a/gin v1 )\n", {"gin"}),
+    ("require ()\nreplace (\n\tgithub.com/a/x => ../b v1\n)\n", set()),
+    ("require ( github.com/a/one v1\n\tgithub.com/b/two v1\n)\n", {"one", "two"}),
+])
+def test_parse_go_mod_deps(dd, tmp_path, text, expected):
+    (tmp_path / "go.mod").write_text(text)
+    assert dd._parse_go_mod_deps(tmp_path) == expected
@@ -0,0 +1,167 @@
+"""Tests for detect-domains.py cache staleness tiers."""
+
+import json
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+
+OLD_DATE = "2000-01-01T00:00:00+00:00"
+DETECTED_AT = "2010-01-01T00:00:00+00:00"
+OLD_EPOCH = 946684800  # OLD_DATE as a timestamp
+
+
+def _git(project: Path, *args: str, date: str | None = None) -> None:
+    env = dict(os.environ)
+    if date:
+        env["GIT_AUTHOR_DATE"] = date
+        env["GIT_COMMITTER_DATE"] = date
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=project, env=env, check=True, capture_output=True,
+    )
+
+
+def _write_json_cache(path: Path, **extra) -> None:
+    payload = {
+        "cache_version": 2,
+        "domains": [{"name": "game-simulation", "confidence": 0.5}],
+        "detected_at": DETECTED_AT,
+        **extra,
+    }
+    path.write_text(json.dumps(payload))
+
+
+@pytest.fixture
+def git_project(tmp_path: Path) -> Path:
+    """A git repo whose only commit predates DETECTED_AT."""
+    if shutil.which("git") is None:
+        pytest.skip("git not available")
+    project = tmp_path / "proj"
+    project.mkdir()
+    (project / "go.mod").write_text("module example.com/x\n")
+    _git(project, "init", "-q")
+    _git(project, "add", "-A")
+    _git(project, "commit", "-q", "-m", "init", date=OLD_DATE)
+    os.utime(project / "go.mod", (OLD_EPOCH, OLD_EPOCH))
+    return project
+
+
+def test_no_cache(dd, tmp_path):
+    assert dd.check_stale(tmp_path, tmp_path / "missing.yaml") == 4
+
+
+def test_version_mismatch_is_stale(dd, tmp_path):
+    cache = tmp_path / "cache.yaml"
+    _write_json_cache(cache, cache_version=1)
+    assert dd.check_stale(tmp_path, cache) == 3
+
+
+def test_stat_and_hash_tiers(dd, tmp_path):
+    """A freshly written cache is fresh until a structural file changes."""
+    (tmp_path / "go.mod").write_text("module example.com/x\n")
+    cache = tmp_path / "cache.yaml"
+    dd.write_cache(
+        cache, [{"name": "cli-tool", "confidence": 0.5}],
+        structural_hash=dd.compute_structural_hash(tmp_path),
+        structural_stat=dd.compute_structural_stat(tmp_path),
+    )
+    assert dd.check_stale(tmp_path, cache) == 0
+    (tmp_path / "go.mod").write_text("module example.com/y\n")
+    assert dd.check_stale(tmp_path, cache) == 3
+
+
+def test_git_tier_heals_fresh_cache(dd, git_project):
+    """A fresh git verdict backfills the structural hash for the fast path."""
+    cache = git_project / "cache.json"
+    _write_json_cache(cache)
+    assert dd.check_stale(git_project, cache) == 0
+    healed = json.loads(cache.read_text())
+    assert healed["structural_hash"] == dd.compute_structural_hash(git_project)
+    assert "structural_stat" in healed
+
+
+def test_git_tier_does_not_heal_over_uncommitted_edit(dd, git_project):
+    """An uncommitted manifest edit is not hashed in; committing it is stale."""
+    cache = git_project / "cache.json"
+    _write_json_cache(cache)
+    (git_project / "go.mod").write_text("module example.com/x\n\nrequire github.com/a/gin v1\n")
+
+    assert dd.check_stale(git_project, cache) == 0  # git sees no commits yet
+    assert "structural_hash" not in json.loads(cache.read_text())
+    _git(git_project, "commit", "-qam", "gin")
+    assert dd.check_stale(git_project, cache) == 3
+
+
+def test_git_tier_catches_nested_structural_extension(dd, git_project):
+    """Nested structural files are caught by git and never healed over."""
+    cache = git_project / "cache.json"
+    _write_json_cache(cache)
+    scenes = git_project / "game" / "scenes"
+    scenes.mkdir(parents=True)
+    (scenes / "level.tscn").write_text("[gd_scene]\n")
+    _git(git_project, "add", "-A")
+    _git(git_project, "commit", "-q", "-m", "level")
+    # Root-level mtimes alone would look unchanged since detection
+    for path in (git_project / "go.mod", git_project):
+        os.utime(path, (OLD_EPOCH, OLD_EPOCH))
+
+    assert dd.check_stale(git_project, cache) == 3
+    assert "structural_hash" not in json.loads(cache.read_text())
+    assert dd.check_stale(git_project, cache) == 3
+
+
+def test_mtime_tier_without_git(dd, tmp_path):
+    (tmp_path / "go.mod").write_text("module example.com/x\n")
+    cache = tmp_path / "cache.json"
+    _write_json_cache(cache)
+    assert dd.check_stale(tmp_path, cache) == 3  # go.mod newer than 2010
+    os.utime(tmp_path / "go.mod", (OLD_EPOCH, OLD_EPOCH))
+    assert dd.check_stale(tmp_path, cache) == 0
+    assert "structural_hash" in json.loads(cache.read_text())
+
+
+def test_yaml_cache_is_not_rewritten(dd, tmp_path):
+    """Hand-edited YAML caches (date-only detected_at) stay read-only."""
+    (tmp_path / "go.mod").write_text("module example.com/x\n")
+    cache = tmp_path / "intersense.yaml"
+    text = (
+        "# hand-edited\n"
+        "cache_version: 2\n"
+        "detected_at: 2026-10-01\n"
+        "domains:\n"
+        "  - name: cli-tool\n"
+        "    confidence: 0.5\n"
+    )
+    cache.write_text(text)
+    for path in (tmp_path / "go.mod", tmp_path):
+        os.utime(path, (OLD_EPOCH, OLD_EPOCH))
+    assert dd.check_stale(tmp_path, cache) == 0
+    assert cache.read_text() == text
+
+
+def test_malformed_stat_snapshot_falls_through(dd, tmp_path):
+    """A hand-edited non-list structural_stat is treated as no snapshot."""
+    (tmp_path / "go.mod").write_text("module example.com/x\n")
+    cache = tmp_path / "cache.json"
+    _write_json_cache(
+        cache,
+        structural_stat={"go.mod": 5},
+        structural_hash=dd.compute_structural_hash(tmp_path),
+    )
+    assert dd.check_stale(tmp_path, cache) == 0
+
+
+def test_hash_from_other_algorithm_falls_through(dd, tmp_path):
+    """A hash written with/without xxhash is not compared, just re-derived."""
+    (tmp_path / "go.mod").write_text("module example.com/x\n")
+    os.utime(tmp_path / "go.mod", (OLD_EPOCH, OLD_EPOCH))
+    other = "sha256" if dd.STRUCTURAL_HASH_ALGO != "sha256" else "xxh3-128"
+    cache = tmp_path / "cache.json"
+    _write_json_cache(cache, structural_hash=f"{other}:00")
+    assert dd.check_stale(tmp_path, cache) == 0
+    healed = json.loads(cache.read_text())["structural_hash"]
+    assert healed == dd.compute_structural_hash(tmp_path)